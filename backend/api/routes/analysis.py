@@ -1,16 +1,24 @@
-from fastapi import APIRouter, HTTPException, Body, Path, Query
+from fastapi import APIRouter, Depends, HTTPException, Body, Path, Query, Request
 from typing import List, Dict, Any
+import asyncio
 import logging
 
+from core.config import settings
+from core.deadline import Deadline, request_deadline
+from core.http_cache import cached_json_response
 from schemas.food import FoodProduct, ProductAnalysis, UserHealthProfile, ComprehensiveAnalysisRequest
-from services.perplexity import perplexity_service
+from services.nutrient_rating import build_partial_analysis
+from services.perplexity import get_perplexity_service
+from services.prefetch import analysis_prefetcher
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 @router.post("/analyze-comprehensive", response_model=ProductAnalysis)
 async def analyze_comprehensive(
-    request: ComprehensiveAnalysisRequest = Body(..., description="Product and user preferences for analysis")
+    http_request: Request,
+    request: ComprehensiveAnalysisRequest = Body(..., description="Product and user preferences for analysis"),
+    deadline: Deadline = Depends(request_deadline),
 ):
     """
     Provide comprehensive analysis of a product based on user preferences
@@ -28,6 +36,14 @@ async def analyze_comprehensive(
     Request body should include:
     - Product data (as returned by the barcode scan endpoint)
     - User health profile with diet types, allergies, and health conditions
+    
+    Responses carry an ETag of the analysis; being a POST, If-None-Match is not evaluated.
+    The X-Profile-Hash response header identifies the profile for prefetching on product lookups.
+    If the analysis was already prefetched by a product lookup, the running work is reused.
+    
+    The request deadline (X-Deadline-Ms header, deadline_ms query parameter or the server default)
+    bounds the whole analysis. When it runs out, the response contains only nutrient ratings and
+    additives computed from the product data, no score or recommendation, and has "partial" set to true.
     """
     if not request.product:
         raise HTTPException(status_code=400, detail="Product information required")
@@ -36,8 +52,25 @@ async def analyze_comprehensive(
         raise HTTPException(status_code=400, detail="Product ingredients required for analysis")
     
     try:
-        analysis = await perplexity_service.analyze_comprehensive(request.product, request.user_preferences)
-        return analysis
+        try:
+            analysis = await asyncio.wait_for(
+                analysis_prefetcher.attach(request.product, request.user_preferences),
+                timeout=deadline.remaining()
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"Deadline exceeded waiting for prefetched analysis of {request.product.barcode}")
+            analysis = build_partial_analysis(request.product)
+        
+        if analysis is None:
+            analysis = await get_perplexity_service().analyze_comprehensive(
+                request.product,
+                request.user_preferences,
+                deadline
+            )
+        
+        response = cached_json_response(http_request, analysis, settings.ANALYSIS_CACHE_MAX_AGE, private=True)
+        response.headers["X-Profile-Hash"] = analysis_prefetcher.remember_profile(request.user_preferences)
+        return response
     except Exception as e:
         logger.error(f"Error in comprehensive analysis endpoint: {str(e)}")
         raise HTTPException(
@@ -1,23 +1,75 @@
-from fastapi import APIRouter, HTTPException, Path, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Path, Query, Request, Response
 from typing import Optional, List
 import logging
 
-from schemas.food import FoodProduct
-from services.openfoodfacts import openfoodfacts_service
+from core.config import settings
+from core.deadline import Deadline, DeadlineExceeded, request_deadline
+from core.http_cache import cached_bytes_response, cached_json_response
+from schemas.food import FoodProduct, ImageSize
+from services.image_proxy import get_image_proxy_service
+from services.openfoodfacts import get_openfoodfacts_service
+from services.prefetch import analysis_prefetcher
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 @router.get("/product/{barcode}", response_model=FoodProduct)
 async def get_product_by_barcode(
-    barcode: str = Path(..., description="Product barcode (EAN, UPC, etc.)"),
+    request: Request,
+    barcode: str = Path(..., description="Product barcode (EAN-8, UPC-E, UPC-A, EAN-13 or GTIN-14)"),
+    x_profile_hash: Optional[str] = Header(None, description="X-Profile-Hash returned by /analyze-comprehensive, opts in to analysis prefetch"),
+    deadline: Deadline = Depends(request_deadline),
 ):
     """
     Get basic product information by barcode from OpenFoodFacts
+    
+    Barcodes with a wrong length or check digit are rejected with a 422, and a 504 is returned
+    if OpenFoodFacts doesn't answer within the request deadline.
+    Responses carry an ETag; send it back in If-None-Match to get a 304 when unchanged.
+    
+    When prefetch is enabled and X-Profile-Hash refers to a profile this server issued the hash for,
+    the comprehensive analysis is started in the background so a following analysis request can reuse it.
     """
-    product = await openfoodfacts_service.get_product_by_barcode(barcode)
+    try:
+        product = await get_openfoodfacts_service().get_product_by_barcode(barcode, deadline)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=f"Invalid barcode: {str(e)}")
+    except DeadlineExceeded:
+        raise HTTPException(status_code=504, detail="Product lookup did not finish within the request deadline")
     
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
     
-    return product 
\ No newline at end of file
+    if settings.PREFETCH_ENABLED and x_profile_hash:
+        # Unknown hashes only disable prefetch, they never fail the lookup
+        user_preferences = analysis_prefetcher.resolve_profile(x_profile_hash)
+        if user_preferences is not None:
+            analysis_prefetcher.start(product, user_preferences)
+    
+    return cached_json_response(request, product, settings.PRODUCT_CACHE_MAX_AGE)
+
+@router.get(
+    "/product/{barcode}/image",
+    response_class=Response,
+    responses={200: {"content": {"image/jpeg": {}}}},
+)
+async def get_product_image(
+    request: Request,
+    barcode: str = Path(..., description="Product barcode (EAN-8, UPC-E, UPC-A, EAN-13 or GTIN-14)"),
+    size: ImageSize = Query(ImageSize.medium, description="Thumbnail size"),
+):
+    """
+    Get a resized JPEG thumbnail of the product photo
+    
+    The original is fetched from OpenFoodFacts once, and all sizes are cached on disk.
+    Responses are served with long-lived caching headers and an ETag.
+    """
+    try:
+        thumbnail = await get_image_proxy_service().get_thumbnail(barcode, size)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=f"Invalid barcode: {str(e)}")
+    
+    if thumbnail is None:
+        raise HTTPException(status_code=404, detail="Product image not found")
+    
+    return cached_bytes_response(request, thumbnail, "image/jpeg", settings.IMAGE_CACHE_MAX_AGE)
@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Query
+from typing import List
+import logging
+
+from schemas.food import ProductSearchResult
+from services.search_index import search_index
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+@router.get("/search", response_model=List[ProductSearchResult])
+async def search_products(
+    q: str = Query(..., min_length=1, max_length=200, description="Words from the product name, brand or ingredients"),
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of results"),
+):
+    """
+    Search products by name, brand or ingredients
+    
+    Matches whole words, prefixes and words with a single typo, ranked by relevance.
+    Only products previously looked up through this API are searchable.
+    """
+    return search_index.search(q, limit)
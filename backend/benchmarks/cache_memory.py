@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Report bytes per cache entry for full Pydantic models versus the compact cache records
+
+Usage: python benchmarks/cache_memory.py [entries]
+"""
+import os
+import random
+import sys
+import tracemalloc
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from schemas.food import (
+    Additive, Citation, FoodProduct, KeyIngredient, NutritionComponent, NutritionFacts, ProductAnalysis
+)
+from services.compact_cache import CompactAnalysis, CompactProduct
+
+INGREDIENTS = [
+    "sugar", "palm oil", "hazelnuts", "skimmed milk powder", "fat-reduced cocoa", "emulsifier",
+    "lecithins", "soya", "vanillin", "wheat flour", "salt", "water", "glucose syrup", "whey powder",
+    "citric acid", "natural flavouring", "rapeseed oil", "corn starch", "yeast", "barley malt extract",
+]
+BRANDS = ["Ferrero", "Nestle", "Danone", "Unilever", "Mondelez", "Kellogg's", "PepsiCo", "Mars"]
+ADDITIVES = [("E322", "Lecithins"), ("E330", "Citric acid"), ("E442", "Ammonium phosphatides"), ("E476", "PGPR")]
+
+
+def make_product(i: int) -> FoodProduct:
+    ingredients = [random.choice(INGREDIENTS) for _ in range(random.randint(5, 25))]
+    return FoodProduct(
+        barcode=f"{3000000000000 + i}",
+        name=f"Product {i}",
+        brand=random.choice(BRANDS),
+        image_url=f"https://images.openfoodfacts.org/images/products/{i}/front_en.400.jpg",
+        ingredients_text=", ".join(ingredients),
+        ingredients_list=ingredients,
+        nutrition_facts=NutritionFacts(
+            per_quantity="100g",
+            energy_kcal=random.uniform(0, 600),
+            fat=random.uniform(0, 40),
+            saturated_fat=random.uniform(0, 20),
+            carbohydrates=random.uniform(0, 80),
+            sugars=random.uniform(0, 60),
+            proteins=random.uniform(0, 20),
+            salt=random.uniform(0, 3),
+        ),
+    )
+
+
+def make_analysis(i: int) -> ProductAnalysis:
+    return ProductAnalysis(
+        health_score=random.randint(0, 100),
+        recommendation="not recommended",
+        recommendation_reason=f"High sugar content for product {i} [1].",
+        nutrition_components=[
+            NutritionComponent(name=name, value=f"{random.uniform(0, 50):.1f}g/100g", health_rating="moderate", reason="Should be limited [1]")
+            for name in ("Sugar", "Fat", "Salt", "Protein")
+        ],
+        key_ingredients=[
+            KeyIngredient(name=name, description="Main ingredient", health_impact="Adds calories [2]")
+            for name in random.sample(INGREDIENTS, 3)
+        ],
+        additives=[
+            Additive(code=code, name=name, safety_level="Safe", description="Emulsifier", potential_effects="Generally safe [3]", source="[3]")
+            for code, name in random.sample(ADDITIVES, 2)
+        ],
+        sources=[Citation(title=f"Source {n}", url=f"https://example.org/{n}") for n in range(1, 4)],
+    )
+
+
+def bytes_per_entry(build, count: int) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    entries = build(count)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del entries
+    return (after - before) / count
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    random.seed(0)
+    # Entries are parsed from JSON inside the measurement so every string is freshly allocated
+    products = [make_product(i).model_dump_json() for i in range(count)]
+    analyses = [make_analysis(i).model_dump_json() for i in range(count)]
+
+    rows = [
+        ("FoodProduct", lambda n: [FoodProduct.model_validate_json(p) for p in products[:n]]),
+        ("CompactProduct", lambda n: [CompactProduct(FoodProduct.model_validate_json(p)) for p in products[:n]]),
+        ("ProductAnalysis", lambda n: [ProductAnalysis.model_validate_json(a) for a in analyses[:n]]),
+        ("CompactAnalysis", lambda n: [CompactAnalysis(ProductAnalysis.model_validate_json(a)) for a in analyses[:n]]),
+    ]
+
+    print(f"{count} entries")
+    for name, build in rows:
+        print(f"{name:>16}: {bytes_per_entry(build, count):8.0f} bytes/entry")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+import gzip
+import logging
+from typing import List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Content types worth compressing; images are already compressed
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "image/svg+xml")
+
+
+class CompressionMiddleware:
+    """
+    Compress response bodies with brotli or gzip based on the client's Accept-Encoding.
+    Compressible responses are buffered, which is fine for the small JSON payloads this API returns.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 500,
+        gzip_level: int = 6,
+        brotli_quality: int = 5,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+        if brotli is None:
+            logger.info("brotli not installed, falling back to gzip only")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = self._select_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        passthrough = False
+        body_parts: List[bytes] = []
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, passthrough
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if "content-encoding" in headers or not headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES):
+                    # Stream anything we would never compress straight through
+                    passthrough = True
+                    await send(message)
+                else:
+                    start_message = message
+                return
+
+            if passthrough or message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            body_parts.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            await self._send_buffered(start_message, b"".join(body_parts), encoding, send)
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _select_encoding(self, accept_encoding: str) -> Optional[str]:
+        """
+        Pick the preferred encoding the client accepts, ignoring q=0 entries
+        """
+        accepted = set()
+        for part in accept_encoding.split(","):
+            token, _, params = part.strip().partition(";")
+            if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+                continue
+            accepted.add(token.strip().lower())
+
+        if brotli is not None and "br" in accepted:
+            return "br"
+        if "gzip" in accepted:
+            return "gzip"
+        return None
+
+    async def _send_buffered(self, start_message: Message, body: bytes, encoding: str, send: Send) -> None:
+        """
+        Compress the buffered body if it qualifies and forward the response
+        """
+        headers = MutableHeaders(raw=start_message["headers"])
+
+        if len(body) >= self.minimum_size:
+            if encoding == "br":
+                body = brotli.compress(body, quality=self.brotli_quality)
+            else:
+                body = gzip.compress(body, compresslevel=self.gzip_level)
+
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+
+            # The ETag hashes the uncompressed body, so it is only a weak validator for these bytes
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = "W/" + etag
+
+        if "accept-encoding" not in headers.get("vary", "").lower():
+            headers.add_vary_header("Accept-Encoding")
+
+        await send(start_message)
+        await send({"type": "http.response.body", "body": body})
@@ -18,8 +18,61 @@ class Settings(BaseSettings):
     PERPLEXITY_API_KEY: str = os.getenv("PERPLEXITY_API_KEY", "")
     PERPLEXITY_API_URL: str = "https://api.perplexity.ai"
     
+    # Request deadlines (seconds), overridable per request with X-Deadline-Ms or ?deadline_ms=
+    REQUEST_DEADLINE_DEFAULT: float = 85.0
+    REQUEST_DEADLINE_MAX: float = 120.0
+    ANALYSIS_MIN_BUDGET: float = 2.0  # Below this, skip Perplexity and answer with a partial result
+    
+    # Analysis tiering: model and search context size by product complexity
+    ANALYSIS_TIERING_ENABLED: bool = True  # When off, every analysis uses the full tier
+    ANALYSIS_TIER_LIGHT_MODEL: str = "sonar"
+    ANALYSIS_TIER_LIGHT_SEARCH_CONTEXT: str = "low"
+    ANALYSIS_TIER_STANDARD_MODEL: str = "sonar-pro"
+    ANALYSIS_TIER_STANDARD_SEARCH_CONTEXT: str = "low"
+    ANALYSIS_TIER_FULL_MODEL: str = "sonar-pro"
+    ANALYSIS_TIER_FULL_SEARCH_CONTEXT: str = "medium"
+    ANALYSIS_TIER_LIGHT_MAX_SCORE: int = 5  # Complexity scores up to this use the light tier
+    ANALYSIS_TIER_STANDARD_MAX_SCORE: int = 20  # Up to this use standard, above it full
+    ANALYSIS_TIER_STANDARD_MIN_BUDGET: float = 15.0  # Seconds of latency budget needed per tier
+    ANALYSIS_TIER_FULL_MIN_BUDGET: float = 40.0
+    
+    # Speculative analysis prefetch on product lookups
+    PREFETCH_ENABLED: bool = False  # Lookups start paid Perplexity calls when enabled
+    PREFETCH_TTL: int = 180  # Seconds a prefetched analysis stays available
+    PREFETCH_MAX_PENDING: int = 100
+    PREFETCH_MAX_PROFILES: int = 1000  # Profiles remembered for X-Profile-Hash lookups
+    
     # Cache configuration
     CACHE_EXPIRATION: int = 86400  # 24 hours in seconds
+    NEGATIVE_CACHE_TTL: int = 600  # How long "product not found" is remembered, in seconds
+    NEGATIVE_CACHE_MAX_SIZE: int = 10000
+    
+    # Product image proxy
+    IMAGE_CACHE_DIR: str = "image_cache"
+    IMAGE_CACHE_MAX_BYTES: int = 200 * 1024 * 1024  # Thumbnails kept on disk before LRU eviction
+    IMAGE_CACHE_MAX_AGE: int = 2592000  # 30 days, thumbnails rarely change
+    IMAGE_MAX_SOURCE_BYTES: int = 10 * 1024 * 1024  # Larger originals are not proxied
+    IMAGE_JPEG_QUALITY: int = 80
+    
+    # HTTP caching headers (max-age in seconds, 0 means always revalidate)
+    PRODUCT_CACHE_MAX_AGE: int = 3600
+    ANALYSIS_CACHE_MAX_AGE: int = 0
+    
+    # Response compression
+    COMPRESSION_MINIMUM_SIZE: int = 500  # bytes
+    
+    # Request profiling (opt-in header or random sampling), written as folded stacks
+    PROFILING_ENABLED: bool = False
+    PROFILING_HEADER: str = "X-Profile"
+    PROFILING_SAMPLE_RATE: float = 0.0  # Fraction of requests to profile without the header
+    PROFILING_INTERVAL: float = 0.005  # Seconds between stack samples
+    PROFILING_OUTPUT_DIR: str = "profiles"
+    PROFILING_SECRET: str = ""  # When set, the profiling header must carry this value
+    PROFILING_MAX_FILES: int = 100  # Oldest profiles beyond this are deleted
+    
+    # Event loop blocking detector
+    LOOP_LAG_THRESHOLD: float = 0.5  # Seconds; 0 disables the monitor
+    LOOP_LAG_CHECK_INTERVAL: float = 0.1
     
     class Config:
         case_sensitive = True
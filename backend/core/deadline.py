@@ -0,0 +1,42 @@
+import time
+from typing import Optional
+
+from fastapi import Header, Query
+
+from core.config import settings
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a request's time budget runs out before upstream work finishes"""
+
+
+class Deadline:
+    """
+    Absolute point in time by which a request must be answered, passed down to upstream calls
+    """
+
+    def __init__(self, budget: float):
+        self.budget = budget
+        self.expires_at = time.monotonic() + budget
+
+    def remaining(self) -> float:
+        """
+        Seconds left in the budget, never negative
+        """
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+
+def request_deadline(
+    x_deadline_ms: Optional[int] = Header(None, ge=1, description="Time budget for this request in milliseconds"),
+    deadline_ms: Optional[int] = Query(None, ge=1, description="Time budget for this request in milliseconds, if headers can't be set"),
+) -> Deadline:
+    """
+    FastAPI dependency building the request's deadline from the header, the query parameter or the server default
+    """
+    budget_ms = x_deadline_ms or deadline_ms
+    budget = budget_ms / 1000 if budget_ms else settings.REQUEST_DEADLINE_DEFAULT
+    return Deadline(min(budget, settings.REQUEST_DEADLINE_MAX))
@@ -0,0 +1,90 @@
+import re
+from typing import Optional
+
+# Lengths of the GTIN family: EAN-8 (or UPC-E), UPC-A, EAN-13 and GTIN-14
+VALID_LENGTHS = (8, 12, 13, 14)
+
+_SEPARATORS = re.compile(r"[\s-]")
+
+
+def gtin_check_digit(digits: str) -> int:
+    """
+    Compute the GS1 check digit for a string of digits without its check digit
+    """
+    total = 0
+    # Weights alternate 3, 1, 3, ... starting from the rightmost digit
+    for i, digit in enumerate(reversed(digits)):
+        total += int(digit) * (3 if i % 2 == 0 else 1)
+    return (10 - total % 10) % 10
+
+
+def expand_upc_e(code: str) -> str:
+    """
+    Expand an 8-digit UPC-E code (number system, six digits, check digit) to its 12-digit UPC-A form
+    """
+    number_system, digits, check = code[0], code[1:7], code[7]
+    last = digits[5]
+
+    if last in "012":
+        body = digits[0:2] + last + "0000" + digits[2:5]
+    elif last == "3":
+        body = digits[0:3] + "00000" + digits[3:5]
+    elif last == "4":
+        body = digits[0:4] + "00000" + digits[4]
+    else:
+        body = digits[0:5] + "0000" + last
+
+    return number_system + body + check
+
+
+def _is_upc_e(code: str) -> bool:
+    if len(code) != 8 or code[0] not in "01":
+        return False
+    upc_a = expand_upc_e(code)
+    return gtin_check_digit(upc_a[:-1]) == int(upc_a[-1])
+
+
+def normalize_gtin(barcode: str) -> str:
+    """
+    Canonicalize an EAN-8, UPC-E, UPC-A, EAN-13 or GTIN-14 barcode to 14-digit GTIN-14.
+    8-digit codes are kept as scanned, since most valid EAN-8 codes starting with 0 or 1 are
+    also valid UPC-E; see upc_e_alternative for the other reading.
+    Raises ValueError when the code is malformed or its check digit is wrong.
+    """
+    code = _SEPARATORS.sub("", barcode or "")
+
+    if not code.isdigit() or not code.isascii():
+        raise ValueError("Barcode must contain only digits")
+
+    if len(code) not in VALID_LENGTHS:
+        raise ValueError(f"Barcode must have 8, 12, 13 or 14 digits, got {len(code)}")
+
+    gtin = code.zfill(14)
+    if gtin_check_digit(code[:-1]) != int(code[-1]) and upc_e_alternative(gtin) is None:
+        raise ValueError("Barcode check digit is invalid")
+
+    return gtin
+
+
+def upc_e_alternative(gtin14: str) -> Optional[str]:
+    """
+    GTIN-14 of the UPC-A expansion when a normalized 8-digit code is also a valid UPC-E, else None
+    """
+    if not gtin14.startswith("000000"):
+        return None
+    code = gtin14[6:]
+    if not _is_upc_e(code):
+        return None
+    return expand_upc_e(code).zfill(14)
+
+
+def to_lookup_code(gtin14: str) -> str:
+    """
+    Convert a GTIN-14 to the form OpenFoodFacts stores products under:
+    EAN-8 (and UPC-E as scanned) stays 8 digits, everything else is shortened to EAN-13 when possible
+    """
+    if gtin14.startswith("000000"):
+        return gtin14[6:]
+    if gtin14.startswith("0"):
+        return gtin14[1:]
+    return gtin14
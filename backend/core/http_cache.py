@@ -0,0 +1,94 @@
+import hashlib
+from typing import Any, Dict, Optional
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+
+def compute_etag(body: bytes) -> str:
+    """
+    Build a strong ETag from the hash of a response body
+    """
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag using weak comparison
+    """
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    target = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == target:
+            return True
+
+    return False
+
+
+def cache_control_value(max_age: int, private: bool = False) -> str:
+    """
+    Format a Cache-Control header value; a max-age of 0 forces revalidation
+    """
+    scope = "private" if private else "public"
+    if max_age <= 0:
+        return f"{scope}, no-cache"
+    return f"{scope}, max-age={max_age}"
+
+
+def cached_json_response(
+    request: Request,
+    content: Any,
+    max_age: int,
+    private: bool = False,
+) -> Response:
+    """
+    Serialize content to JSON with an ETag and Cache-Control header.
+    For GET and HEAD, returns an empty 304 response when the client already holds the same representation.
+    """
+    response = JSONResponse(content=jsonable_encoder(content))
+    return _with_validators(request, response, max_age, private, {"Vary": "Accept-Encoding"})
+
+
+def cached_bytes_response(
+    request: Request,
+    body: bytes,
+    media_type: str,
+    max_age: int,
+    private: bool = False,
+) -> Response:
+    """
+    Same as cached_json_response for an already encoded body such as an image
+    """
+    response = Response(content=body, media_type=media_type)
+    return _with_validators(request, response, max_age, private)
+
+
+def _with_validators(
+    request: Request,
+    response: Response,
+    max_age: int,
+    private: bool,
+    extra_headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    etag = compute_etag(response.body)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": cache_control_value(max_age, private),
+        **(extra_headers or {}),
+    }
+
+    # If-None-Match only yields a 304 for safe methods (RFC 9110 section 13.1.2)
+    if request.method in ("GET", "HEAD") and etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return response
@@ -0,0 +1,208 @@
+import asyncio
+import hmac
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+import traceback
+import uuid
+from collections import Counter
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+
+def _collapse_stack(frame) -> str:
+    """
+    Render a frame and its callers as a root-first, semicolon separated line (folded stack format)
+    """
+    parts = []
+    while frame is not None:
+        code = frame.f_code
+        parts.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+        frame = frame.f_back
+    return ";".join(reversed(parts))
+
+
+class SamplingProfiler:
+    """
+    Samples the stack of one thread at a fixed interval from a background thread.
+    Output is in the folded format read by flamegraph.pl, speedscope and inferno.
+    """
+
+    def __init__(self, thread_id: int, interval: float = 0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.samples[_collapse_stack(frame)] += 1
+
+    def write_folded(self, path: str) -> None:
+        with open(path, "w") as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class ProfilingMiddleware:
+    """
+    Profile requests that carry the opt-in header or are picked by the sampling rate.
+    When a secret is set, the header only opts in if its value matches it.
+    Only the newest `max_files` profiles are kept on disk.
+    The sampler watches the event loop thread, so concurrent requests show up in the same profile.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        output_dir: str,
+        header: str = "X-Profile",
+        sample_rate: float = 0.0,
+        interval: float = 0.005,
+        secret: str = "",
+        max_files: int = 100,
+    ):
+        self.app = app
+        self.output_dir = output_dir
+        self.header = header.lower()
+        self.sample_rate = sample_rate
+        self.interval = interval
+        self.secret = secret
+        self.max_files = max_files
+
+        os.makedirs(self.output_dir, exist_ok=True)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = uuid.uuid4().hex[:12]
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)["X-Profile-Id"] = profile_id
+            await send(message)
+
+        profiler = SamplingProfiler(threading.get_ident(), self.interval)
+        started_at = time.perf_counter()
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.stop()
+            elapsed_ms = (time.perf_counter() - started_at) * 1000
+
+            slug = re.sub(r"[^A-Za-z0-9]+", "_", scope["path"]).strip("_") or "root"
+            filename = f"{time.strftime('%Y%m%d-%H%M%S')}-{scope['method']}-{slug}-{profile_id}.folded"
+            path = os.path.join(self.output_dir, filename)
+            await asyncio.to_thread(self._save, profiler, path)
+
+            total_samples = sum(profiler.samples.values())
+            logger.info(f"Profiled {scope['method']} {scope['path']} in {elapsed_ms:.1f} ms ({total_samples} samples) -> {path}")
+
+    def _should_profile(self, scope: Scope) -> bool:
+        value = Headers(scope=scope).get(self.header)
+        if value is not None and (not self.secret or hmac.compare_digest(value.encode(), self.secret.encode())):
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def _save(self, profiler: SamplingProfiler, path: str) -> None:
+        """
+        Write the profile, then delete the oldest ones beyond max_files
+        """
+        profiler.write_folded(path)
+
+        profiles = [
+            os.path.join(self.output_dir, name)
+            for name in os.listdir(self.output_dir)
+            if name.endswith(".folded")
+        ]
+        if len(profiles) <= self.max_files:
+            return
+
+        profiles.sort(key=os.path.getmtime)
+        for old_path in profiles[:len(profiles) - self.max_files]:
+            try:
+                os.remove(old_path)
+            except OSError:
+                pass
+
+
+class EventLoopLagMonitor:
+    """
+    Detect coroutines that block the event loop.
+    A heartbeat task runs on the loop and a watchdog thread logs the loop thread's stack
+    whenever the heartbeat falls more than `threshold` seconds behind.
+    """
+
+    def __init__(self, threshold: float = 0.5, interval: float = 0.1):
+        self.threshold = threshold
+        self.interval = interval
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def start(self) -> None:
+        """
+        Start monitoring; must be called from the event loop thread
+        """
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._beat())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-lag-watchdog", daemon=True)
+        self._watchdog.start()
+        logger.info(f"Event loop lag monitor started (threshold {self.threshold * 1000:.0f} ms)")
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+        if self._watchdog is not None:
+            await asyncio.to_thread(self._watchdog.join)
+
+    async def _beat(self) -> None:
+        # Only records liveness; the watchdog thread does the reporting
+        while True:
+            self._heartbeat = time.monotonic()
+            await asyncio.sleep(self.interval)
+
+    def _watch(self) -> None:
+        reported_heartbeat = None
+        while not self._stop.wait(self.interval):
+            heartbeat = self._heartbeat
+            behind = time.monotonic() - heartbeat - self.interval
+            # Report each blocking episode once, while the offending code is still on the stack
+            if behind <= self.threshold or heartbeat == reported_heartbeat:
+                continue
+
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+
+            reported_heartbeat = heartbeat
+            stack = "".join(traceback.format_stack(frame))
+            logger.warning(f"Event loop blocked for over {behind * 1000:.0f} ms, loop thread stack:\n{stack}")
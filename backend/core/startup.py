@@ -0,0 +1,70 @@
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class StartupReport:
+    """
+    Collects per-phase import and initialization timings from process start until the service is warm.
+    This module only uses the standard library so it can be imported before anything heavy.
+    """
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.phases: List[Dict[str, Any]] = []
+        self.ready = False
+        self.ready_after: Optional[float] = None
+        self.error: Optional[str] = None
+        self._depth = 0
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        Time a block of startup work; nested phases are recorded with their depth
+        """
+        start = time.perf_counter()
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            self.phases.append({
+                "name": name,
+                "depth": self._depth,
+                "offset_ms": round((start - self.started_at) * 1000, 1),
+                "duration_ms": round((time.perf_counter() - start) * 1000, 1),
+            })
+
+    def mark_ready(self) -> None:
+        """
+        Flip readiness and log the collected timings
+        """
+        self.ready = True
+        self.ready_after = time.perf_counter() - self.started_at
+
+        logger.info(f"Service ready {self.ready_after * 1000:.1f} ms after start")
+        for phase in sorted(self.phases, key=lambda p: (p["offset_ms"], p["depth"])):
+            indent = "  " * phase["depth"]
+            logger.info(f"  {indent}{phase['name']}: {phase['duration_ms']} ms")
+
+    def mark_failed(self, error: Exception) -> None:
+        """
+        Record a failed warm-up; the service stays not ready
+        """
+        self.error = str(error)
+        logger.error(f"Service warm-up failed: {error}")
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "ready_after_ms": round(self.ready_after * 1000, 1) if self.ready_after is not None else None,
+            "uptime_ms": round((time.perf_counter() - self.started_at) * 1000, 1),
+            "error": self.error,
+            "phases": sorted(self.phases, key=lambda p: (p["offset_ms"], p["depth"])),
+        }
+
+
+startup_report = StartupReport()
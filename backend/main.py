@@ -1,13 +1,73 @@
-from fastapi import FastAPI, Depends
-from fastapi.middleware.cors import CORSMiddleware
+import asyncio
+import importlib
+import logging
+from contextlib import asynccontextmanager
+
+from core.startup import startup_report
+
+with startup_report.phase("import fastapi"):
+    from fastapi import FastAPI, Depends
+    from fastapi.middleware.cors import CORSMiddleware
+    from fastapi.responses import JSONResponse
+
+with startup_report.phase("import routes"):
+    from api.routes import barcode, analysis, search
+    from core.compression import CompressionMiddleware
+    from core.config import settings
+    from core.profiling import EventLoopLagMonitor, ProfilingMiddleware
+
+logger = logging.getLogger(__name__)
+
+
+async def warm_up():
+    """
+    Load deferred dependencies and build the services in the background, then flip readiness
+    """
+    try:
+        with startup_report.phase("warm up"):
+            with startup_report.phase("import httpx"):
+                # Import off the event loop so /health keeps answering meanwhile
+                await asyncio.to_thread(importlib.import_module, "httpx")
+
+            with startup_report.phase("init openfoodfacts_service"):
+                from services.openfoodfacts import get_openfoodfacts_service
+                get_openfoodfacts_service()
+
+            with startup_report.phase("init perplexity_service"):
+                from services.perplexity import get_perplexity_service
+                get_perplexity_service()
+
+            with startup_report.phase("init image_proxy_service"):
+                # Indexes the thumbnail directory, which touches the disk
+                from services.image_proxy import get_image_proxy_service
+                await asyncio.to_thread(get_image_proxy_service)
+
+        startup_report.mark_ready()
+    except Exception as e:
+        startup_report.mark_failed(e)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    warm_up_task = asyncio.create_task(warm_up())
+    
+    lag_monitor = None
+    if settings.LOOP_LAG_THRESHOLD > 0:
+        lag_monitor = EventLoopLagMonitor(settings.LOOP_LAG_THRESHOLD, settings.LOOP_LAG_CHECK_INTERVAL)
+        lag_monitor.start()
+    
+    yield
+    
+    warm_up_task.cancel()
+    if lag_monitor is not None:
+        await lag_monitor.stop()
 
-from api.routes import barcode, analysis
-from core.config import settings
 
 app = FastAPI(
     title="What's In It API",
     description="API for analyzing food products based on barcode scanning",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
 
 # CORS middleware configuration
@@ -17,11 +77,28 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Profile-Id", "X-Profile-Hash"],
 )
 
+# Compress JSON responses for clients that accept brotli or gzip
+app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MINIMUM_SIZE)
+
+# Sampling profiler for opted-in requests; added last so it also covers the other middleware
+if settings.PROFILING_ENABLED:
+    app.add_middleware(
+        ProfilingMiddleware,
+        output_dir=settings.PROFILING_OUTPUT_DIR,
+        header=settings.PROFILING_HEADER,
+        sample_rate=settings.PROFILING_SAMPLE_RATE,
+        interval=settings.PROFILING_INTERVAL,
+        secret=settings.PROFILING_SECRET,
+        max_files=settings.PROFILING_MAX_FILES,
+    )
+
 # Include routers
 app.include_router(barcode.router, prefix="/api/v1", tags=["barcode"])
 app.include_router(analysis.router, prefix="/api/v1", tags=["analysis"])
+app.include_router(search.router, prefix="/api/v1", tags=["search"])
 
 @app.get("/")
 async def root():
@@ -36,6 +113,13 @@ async def health_check():
     """Health check endpoint for load balancers"""
     return {"status": "healthy", "service": "What's In It API"}
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness endpoint that only succeeds once services are warm, with the startup timing report"""
+    report = startup_report.as_dict()
+    status_code = 200 if startup_report.ready else 503
+    return JSONResponse(status_code=status_code, content=report)
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True) 
\ No newline at end of file
+    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
@@ -1,3 +1,4 @@
+from enum import Enum
 from typing import Dict, List, Optional
 from pydantic import BaseModel, Field
 
@@ -35,6 +36,22 @@ class FoodProduct(BaseModel):
     nutrition_facts: Optional[NutritionFacts] = None
 
 
+class ImageSize(str, Enum):
+    """Standard thumbnail sizes served by the product image proxy"""
+    small = "small"
+    medium = "medium"
+    large = "large"
+
+
+class ProductSearchResult(BaseModel):
+    """A product matched by name, brand or ingredient search"""
+    barcode: str
+    name: str
+    brand: Optional[str] = None
+    image_url: Optional[str] = None
+    score: float = 0.0
+
+
 class NutritionComponent(BaseModel):
     name: str
     value: str  # e.g., "10g/100g"
@@ -71,13 +88,15 @@ class Citation(BaseModel):
 
 
 class ProductAnalysis(BaseModel):
-    health_score: int = Field(..., ge=0, le=100)  # Overall health score (0-100)
-    recommendation: str  # "recommended", "not recommended"
+    health_score: Optional[int] = Field(..., ge=0, le=100)  # Overall health score (0-100), None on partial results
+    recommendation: Optional[str]  # "recommended", "not recommended", None on partial results
     recommendation_reason: str
     nutrition_components: List[NutritionComponent] = []
     key_ingredients: List[KeyIngredient] = []
     additives: List[Additive] = []
     sources: Optional[List[Citation]] = None  # Structured source references
+    analysis_tier: Optional[str] = None  # Tier that served the analysis: "light", "standard" or "full"; None for fallbacks
+    partial: bool = False  # True when only local nutrient ratings and additives could be computed within the deadline
 
 
 class ComprehensiveAnalysisRequest(BaseModel):
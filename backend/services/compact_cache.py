@@ -0,0 +1,110 @@
+import math
+import sys
+import zlib
+from array import array
+from typing import Optional, Tuple, Union
+
+from schemas.food import FoodProduct, NutritionFacts, ProductAnalysis
+
+# Order of the floats packed into CompactProduct.nutrition
+NUTRIENT_FIELDS = (
+    "energy_kj",
+    "energy_kcal",
+    "fat",
+    "saturated_fat",
+    "carbohydrates",
+    "sugars",
+    "fiber",
+    "proteins",
+    "salt",
+    "sodium",
+)
+
+# Ingredient texts shorter than this are kept as plain strings, compression would not pay off
+COMPRESS_MIN_LENGTH = 200
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if value else value
+
+
+class CompactProduct:
+    """
+    Memory-efficient cache record for a FoodProduct.
+    Nutrition values are packed into a float array (NaN for missing), repeated strings such as
+    brands and ingredient names are interned, and long ingredient texts are zlib-compressed.
+    """
+
+    __slots__ = ("barcode", "name", "brand", "image_url", "ingredients_text", "ingredients_list", "per_quantity", "nutrition")
+
+    def __init__(self, product: FoodProduct):
+        self.barcode = product.barcode
+        self.name = product.name
+        self.brand = _intern(product.brand)
+        self.image_url = product.image_url
+
+        text = product.ingredients_text
+        self.ingredients_text: Union[str, bytes, None] = (
+            zlib.compress(text.encode("utf-8")) if text and len(text) >= COMPRESS_MIN_LENGTH else text
+        )
+        self.ingredients_list: Optional[Tuple[str, ...]] = (
+            tuple(sys.intern(ingredient) for ingredient in product.ingredients_list)
+            if product.ingredients_list is not None else None
+        )
+
+        facts = product.nutrition_facts
+        if facts is None:
+            self.per_quantity = None
+            self.nutrition = None
+        else:
+            self.per_quantity = sys.intern(facts.per_quantity)
+            self.nutrition = array("d", (
+                math.nan if getattr(facts, field) is None else getattr(facts, field)
+                for field in NUTRIENT_FIELDS
+            ))
+
+    def to_model(self, barcode: Optional[str] = None) -> FoodProduct:
+        """
+        Rehydrate the full Pydantic model, optionally under the barcode it was requested with
+        """
+        text = self.ingredients_text
+        if isinstance(text, bytes):
+            text = zlib.decompress(text).decode("utf-8")
+
+        nutrition_facts = None
+        if self.nutrition is not None:
+            nutrition_facts = NutritionFacts(
+                per_quantity=self.per_quantity,
+                **{
+                    field: None if math.isnan(value) else value
+                    for field, value in zip(NUTRIENT_FIELDS, self.nutrition)
+                }
+            )
+
+        return FoodProduct(
+            barcode=barcode or self.barcode,
+            name=self.name,
+            brand=self.brand,
+            image_url=self.image_url,
+            ingredients_text=text,
+            ingredients_list=list(self.ingredients_list) if self.ingredients_list is not None else None,
+            nutrition_facts=nutrition_facts,
+        )
+
+
+class CompactAnalysis:
+    """
+    Cache record for a ProductAnalysis, stored as zlib-compressed JSON.
+    Analyses are read far less often than they are kept, so paying for validation on access is fine.
+    """
+
+    __slots__ = ("payload",)
+
+    def __init__(self, analysis: ProductAnalysis):
+        self.payload = zlib.compress(analysis.model_dump_json().encode("utf-8"))
+
+    def to_model(self) -> ProductAnalysis:
+        """
+        Rehydrate the full Pydantic model
+        """
+        return ProductAnalysis.model_validate_json(zlib.decompress(self.payload))
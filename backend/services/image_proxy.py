@@ -0,0 +1,232 @@
+import asyncio
+import io
+import logging
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Optional
+
+from core.config import settings
+from core.gtin import normalize_gtin
+from schemas.food import ImageSize
+from services.openfoodfacts import get_openfoodfacts_service
+
+logger = logging.getLogger(__name__)
+
+# Longest edge in pixels for each standard thumbnail size
+THUMBNAIL_PIXELS = {
+    ImageSize.small: 128,
+    ImageSize.medium: 400,
+    ImageSize.large: 800,
+}
+
+
+class ThumbnailCache:
+    """
+    Size-bounded on-disk cache with least-recently-used eviction.
+    Recency is kept in memory and mirrored to file mtimes so it survives restarts.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.entries: "OrderedDict[str, int]" = OrderedDict()  # filename -> size, oldest first
+        self.total_bytes = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._load()
+
+    def _load(self) -> None:
+        """
+        Index files left by a previous run, least recently used first
+        """
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and not entry.name.endswith(".tmp"):
+                stat = entry.stat()
+                files.append((stat.st_mtime, entry.name, stat.st_size))
+
+        for _, name, size in sorted(files):
+            self.entries[name] = size
+            self.total_bytes += size
+
+        logger.info(f"Thumbnail cache loaded {len(self.entries)} files ({self.total_bytes} bytes) from {self.directory}")
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Read a cached file and mark it as recently used
+        """
+        with self._lock:
+            if key not in self.entries:
+                return None
+            self.entries.move_to_end(key)
+
+        path = os.path.join(self.directory, key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+            return data
+        except OSError:
+            # Evicted or removed underneath us
+            with self._lock:
+                if key in self.entries:
+                    self.total_bytes -= self.entries.pop(key)
+            return None
+
+    def put(self, key: str, data: bytes) -> None:
+        """
+        Store a file atomically, then evict least recently used files until under the size bound
+        """
+        path = os.path.join(self.directory, key)
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        with self._lock:
+            if key in self.entries:
+                self.total_bytes -= self.entries.pop(key)
+            self.entries[key] = len(data)
+            self.total_bytes += len(data)
+
+            while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+                evicted, size = self.entries.popitem(last=False)
+                self.total_bytes -= size
+                try:
+                    os.remove(os.path.join(self.directory, evicted))
+                except OSError as e:
+                    logger.warning(f"Could not remove evicted thumbnail {evicted}: {e}")
+
+
+class ImageProxyService:
+    """
+    Serves resized product photos. The original is fetched from OpenFoodFacts once and every
+    standard size is rendered from it, so later requests for any size are served from disk.
+    """
+
+    def __init__(self):
+        self.cache = ThumbnailCache(settings.IMAGE_CACHE_DIR, settings.IMAGE_CACHE_MAX_BYTES)
+        self.user_agent = settings.OPENFOODFACTS_USER_AGENT
+        self._renders: Dict[str, asyncio.Task] = {}  # GTIN-14 -> in-flight fetch and render
+
+    async def get_thumbnail(self, barcode: str, size: ImageSize) -> Optional[bytes]:
+        """
+        Return the JPEG thumbnail of a product's photo, or None if the product has no usable image.
+        Raises ValueError if the barcode is not a valid GTIN.
+        """
+        gtin = normalize_gtin(barcode)
+        key = self._cache_key(gtin, size)
+
+        thumbnail = await asyncio.to_thread(self.cache.get, key)
+        if thumbnail is not None:
+            return thumbnail
+
+        # One fetch per product even when several sizes are requested at once
+        render = self._renders.get(gtin)
+        if render is None:
+            render = asyncio.create_task(self._render_from_source(gtin))
+            self._renders[gtin] = render
+            render.add_done_callback(lambda _: self._renders.pop(gtin, None))
+
+        # Shielded so one client disconnecting doesn't cancel the render for everyone else
+        thumbnails = await asyncio.shield(render)
+        return thumbnails.get(size) if thumbnails else None
+
+    async def _render_from_source(self, gtin: str) -> Optional[Dict[ImageSize, bytes]]:
+        """
+        Fetch the original photo and store every standard size
+        """
+        product = await get_openfoodfacts_service().get_product_by_barcode(gtin)
+        if not product or not product.image_url:
+            return None
+
+        original = await self._fetch_original(product.image_url)
+        if original is None:
+            return None
+
+        try:
+            thumbnails = await asyncio.to_thread(self._render_thumbnails, original)
+        except Exception as e:
+            logger.error(f"Could not decode image for product {gtin}: {e}")
+            return None
+
+        try:
+            for size, data in thumbnails.items():
+                await asyncio.to_thread(self.cache.put, self._cache_key(gtin, size), data)
+        except OSError as e:
+            # The thumbnails are still served from memory, they just get rendered again next time
+            logger.error(f"Could not cache thumbnails for product {gtin}: {e}")
+        else:
+            logger.info(f"Cached {len(thumbnails)} thumbnails for product {gtin} from {len(original)} byte original")
+        return thumbnails
+
+    async def _fetch_original(self, url: str) -> Optional[bytes]:
+        """
+        Download the original image, giving up as soon as it is known to exceed IMAGE_MAX_SOURCE_BYTES
+        """
+        import httpx  # Deferred so importing this module stays cheap at startup
+
+        limit = settings.IMAGE_MAX_SOURCE_BYTES
+        try:
+            async with httpx.AsyncClient(timeout=15.0, follow_redirects=True) as client:
+                async with client.stream("GET", url, headers={"User-Agent": self.user_agent}) as response:
+                    response.raise_for_status()
+
+                    content_length = response.headers.get("content-length")
+                    if content_length and content_length.isdigit() and int(content_length) > limit:
+                        logger.warning(f"Image {url} is larger than {limit} bytes, not proxying it")
+                        return None
+
+                    chunks = []
+                    received = 0
+                    async for chunk in response.aiter_bytes():
+                        received += len(chunk)
+                        if received > limit:
+                            logger.warning(f"Image {url} is larger than {limit} bytes, not proxying it")
+                            return None
+                        chunks.append(chunk)
+        except httpx.HTTPError as e:
+            logger.error(f"HTTP error occurred while fetching image {url}: {e}")
+            return None
+
+        return b"".join(chunks)
+
+    def _render_thumbnails(self, original: bytes) -> Dict[ImageSize, bytes]:
+        """
+        Resize and recompress the original into every standard size; runs in a worker thread
+        """
+        from PIL import Image, ImageOps  # Deferred, Pillow is only needed once an image is requested
+
+        with Image.open(io.BytesIO(original)) as image:
+            image = ImageOps.exif_transpose(image).convert("RGB")
+
+            thumbnails = {}
+            for size, pixels in THUMBNAIL_PIXELS.items():
+                resized = image.copy()
+                resized.thumbnail((pixels, pixels), Image.LANCZOS)
+
+                buffer = io.BytesIO()
+                resized.save(buffer, format="JPEG", quality=settings.IMAGE_JPEG_QUALITY, optimize=True, progressive=True)
+                thumbnails[size] = buffer.getvalue()
+
+        return thumbnails
+
+    @staticmethod
+    def _cache_key(gtin: str, size: ImageSize) -> str:
+        return f"{gtin}-{size.value}.jpg"
+
+
+@lru_cache(maxsize=None)
+def get_image_proxy_service() -> ImageProxyService:
+    """
+    Return the shared service, creating it on first use
+    """
+    return ImageProxyService()
@@ -0,0 +1,74 @@
+from typing import List, Optional
+
+from schemas.food import Additive, FoodProduct, NutritionComponent, NutritionFacts, ProductAnalysis
+from services.tiering import detect_additives
+
+# Front-of-pack traffic light thresholds in grams: (low up to, high above).
+# UK Food Standards Agency guidance, per 100g for foods and per 100ml for drinks.
+# Values declared on any other basis (e.g. per serving) are not rated.
+TRAFFIC_LIGHTS = {
+    "100g": [
+        ("Fat", "fat", 3.0, 17.5),
+        ("Saturated fat", "saturated_fat", 1.5, 5.0),
+        ("Sugars", "sugars", 5.0, 22.5),
+        ("Salt", "salt", 0.3, 1.5),
+    ],
+    "100ml": [
+        ("Fat", "fat", 1.5, 8.75),
+        ("Saturated fat", "saturated_fat", 0.75, 2.5),
+        ("Sugars", "sugars", 2.5, 11.25),
+        ("Salt", "salt", 0.3, 0.75),
+    ],
+}
+
+
+def rate_nutrients(facts: Optional[NutritionFacts]) -> List[NutritionComponent]:
+    """
+    Rate fat, saturated fat, sugars and salt against fixed traffic light thresholds.
+    Values declared per serving are not rated, since the thresholds are per 100g or 100ml.
+    """
+    if facts is None:
+        return []
+
+    per_quantity = (facts.per_quantity or "").replace(" ", "").lower()
+    thresholds = TRAFFIC_LIGHTS.get(per_quantity)
+    if thresholds is None:
+        return []
+
+    components = []
+    for name, field, low, high in thresholds:
+        value = getattr(facts, field)
+        if value is None:
+            continue
+
+        if value <= low:
+            rating, level = "healthy", "low"
+        elif value <= high:
+            rating, level = "moderate", "medium"
+        else:
+            rating, level = "unhealthy", "high"
+
+        components.append(NutritionComponent(
+            name=name,
+            value=f"{value:g}g/{per_quantity}",
+            health_rating=rating,
+            reason=f"{level.capitalize()} {name.lower()} by food traffic light thresholds ({low:g}g / {high:g}g per {per_quantity})"
+        ))
+
+    return components
+
+
+def build_partial_analysis(product: FoodProduct) -> ProductAnalysis:
+    """
+    Analysis computed locally when the full analysis can't finish within the deadline.
+    Only contains traffic light nutrient ratings and detected additives; there is no score or
+    recommendation, since those depend on the user's profile.
+    """
+    return ProductAnalysis(
+        health_score=None,
+        recommendation=None,
+        recommendation_reason="Partial result: the full analysis did not finish in time. Only nutrient levels and additives from the product data are shown, without a score or recommendation.",
+        nutrition_components=rate_nutrients(product.nutrition_facts),
+        additives=[Additive(code=code, name=code) for code in detect_additives(product)],
+        partial=True
+    )
@@ -1,49 +1,72 @@
-import httpx
+import asyncio
 import logging
+import time
+from functools import lru_cache
 from typing import Dict, Any, Optional
 
 from core.config import settings
+from core.deadline import Deadline, DeadlineExceeded
+from core.gtin import normalize_gtin, to_lookup_code, upc_e_alternative
 from schemas.food import FoodProduct, NutritionFacts
+from services.compact_cache import CompactProduct
+from services.search_index import search_index
 
 logger = logging.getLogger(__name__)
 
 class OpenFoodFactsService:
     def __init__(self):
         self.base_url = settings.OPENFOODFACTS_API_URL
-        self.cache = {}  # Simple in-memory cache
+        self.cache: Dict[str, CompactProduct] = {}  # In-memory cache of compact records, keyed by GTIN-14
+        self.negative_cache: Dict[str, float] = {}  # GTIN-14 -> expiry of a "not found" result
         self.user_agent = settings.OPENFOODFACTS_USER_AGENT
         
-    async def get_product_by_barcode(self, barcode: str) -> Optional[FoodProduct]:
+    async def get_product_by_barcode(self, barcode: str, deadline: Optional[Deadline] = None) -> Optional[FoodProduct]:
         """
-        Fetch product information from Open Food Facts API by barcode
+        Fetch product information from Open Food Facts API by barcode.
+        The barcode is canonicalized to GTIN-14 so UPC-A and EAN-13 scans share a cache entry;
+        the returned product always carries the barcode as it was requested.
+        8-digit codes are looked up as scanned first and, if unknown, as the UPC-A expansion of a UPC-E.
+        Raises ValueError if the barcode is not a valid GTIN, and DeadlineExceeded if the
+        deadline runs out before OpenFoodFacts answers.
         """
-        # Check cache first
-        if barcode in self.cache:
-            logger.info(f"Cache hit for barcode {barcode}")
-            return self.cache[barcode]
+        gtin = normalize_gtin(barcode)
+        candidates = [gtin]
+        upc_a = upc_e_alternative(gtin)
+        if upc_a is not None:
+            candidates.append(upc_a)
         
-        url = f"{self.base_url}/product/{barcode}"
+        import httpx  # Deferred so importing this module stays cheap at startup
         
         try:
-            headers = {
-                "User-Agent": self.user_agent
-            }
-            
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, headers=headers)
-                response.raise_for_status()
-                data = response.json()
+            for candidate in candidates:
+                # Check cache first
+                if candidate in self.cache:
+                    logger.info(f"Cache hit for barcode {barcode}")
+                    self.cache[gtin] = self.cache[candidate]
+                    return self.cache[candidate].to_model(barcode)
                 
-                if data.get("status") != 1:
-                    logger.warning(f"Product not found: {barcode}")
-                    return None
+                if self._is_known_missing(candidate):
+                    logger.info(f"Negative cache hit for barcode {barcode} ({candidate})")
+                    continue
                 
-                product = self._parse_product_data(data["product"], barcode)
+                product = await self._fetch_product(candidate, barcode, deadline)
+                if product is None:
+                    self._remember_missing(candidate)
+                    continue
                 
-                # Cache the result
-                self.cache[barcode] = product
+                # Cache the result, under the scanned code as well when found via the UPC-E expansion
+                compact = CompactProduct(product)
+                self.cache[candidate] = compact
+                self.cache[gtin] = compact
+                self.negative_cache.pop(gtin, None)
                 return product
+            
+            logger.warning(f"Product not found: {barcode}")
+            return None
                 
+        except DeadlineExceeded:
+            logger.warning(f"Deadline exceeded while fetching product {barcode}")
+            raise
         except httpx.HTTPError as e:
             logger.error(f"HTTP error occurred while fetching product {barcode}: {e}")
             return None
@@ -51,6 +74,64 @@ class OpenFoodFactsService:
             logger.error(f"Error occurred while fetching product {barcode}: {e}")
             return None
     
+    async def _fetch_product(self, gtin: str, barcode: str, deadline: Optional[Deadline]) -> Optional[FoodProduct]:
+        """
+        Query OpenFoodFacts for one GTIN-14; returns None when the product is unknown
+        """
+        import httpx
+        
+        url = f"{self.base_url}/product/{to_lookup_code(gtin)}"
+        headers = {
+            "User-Agent": self.user_agent
+        }
+        
+        async with httpx.AsyncClient() as client:
+            timeout = deadline.remaining() if deadline else None
+            try:
+                response = await asyncio.wait_for(client.get(url, headers=headers), timeout=timeout)
+            except asyncio.TimeoutError:
+                raise DeadlineExceeded(f"Deadline exceeded while fetching product {barcode}")
+            
+            # The v2 API answers unknown products with a 404
+            if response.status_code == 404:
+                return None
+            
+            response.raise_for_status()
+            data = response.json()
+            
+            if data.get("status") != 1:
+                return None
+            
+            return self._parse_product_data(data["product"], barcode)
+    
+    def _is_known_missing(self, gtin: str) -> bool:
+        """
+        Check the negative cache, dropping the entry once it has expired
+        """
+        expires_at = self.negative_cache.get(gtin)
+        if expires_at is None:
+            return False
+        
+        if expires_at <= time.monotonic():
+            del self.negative_cache[gtin]
+            return False
+        
+        return True
+    
+    def _remember_missing(self, gtin: str) -> None:
+        """
+        Record a "not found" result for a short time so retries don't hit the upstream
+        """
+        now = time.monotonic()
+        
+        if len(self.negative_cache) >= settings.NEGATIVE_CACHE_MAX_SIZE:
+            self.negative_cache = {k: v for k, v in self.negative_cache.items() if v > now}
+            # Still full: evict the oldest entries, dicts keep insertion order
+            while len(self.negative_cache) >= settings.NEGATIVE_CACHE_MAX_SIZE:
+                del self.negative_cache[next(iter(self.negative_cache))]
+        
+        self.negative_cache[gtin] = now + settings.NEGATIVE_CACHE_TTL
+    
     def _parse_product_data(self, data: Dict[str, Any], barcode: str) -> FoodProduct:
         """
         Parse the OpenFoodFacts API response into our FoodProduct model
@@ -93,6 +174,9 @@ class OpenFoodFactsService:
             nutrition_facts=nutrition
         )
         
+        # Make the product findable by name, brand and ingredients
+        search_index.add(product)
+        
         return product
     
     def _extract_nutrient(self, data: Dict[str, Any], nutrient_name: str) -> Optional[float]:
@@ -111,4 +195,9 @@ class OpenFoodFactsService:
         
         return None
 
-openfoodfacts_service = OpenFoodFactsService() 
\ No newline at end of file
+@lru_cache(maxsize=None)
+def get_openfoodfacts_service() -> OpenFoodFactsService:
+    """
+    Return the shared service, creating it on first use
+    """
+    return OpenFoodFactsService()
@@ -1,11 +1,15 @@
+import asyncio
 import json
 import logging
-import httpx
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 import re
 
 from core.config import settings
+from core.deadline import Deadline
 from schemas.food import Additive, FoodProduct, ProductAnalysis, NutritionComponent, KeyIngredient, UserHealthProfile, Citation
+from services.nutrient_rating import build_partial_analysis
+from services.tiering import analysis_tier_policy
 
 logger = logging.getLogger(__name__)
 
@@ -14,9 +18,17 @@ class PerplexitySonarService:
         self.api_key = settings.PERPLEXITY_API_KEY
         self.api_url = settings.PERPLEXITY_API_URL
     
-    async def analyze_comprehensive(self, product: FoodProduct, user_preferences: UserHealthProfile) -> ProductAnalysis:
+    async def analyze_comprehensive(
+        self,
+        product: FoodProduct,
+        user_preferences: UserHealthProfile,
+        deadline: Optional[Deadline] = None,
+    ) -> ProductAnalysis:
         """
-        Provide a comprehensive analysis of a product considering user preferences and health conditions
+        Provide a comprehensive analysis of a product considering user preferences and health conditions.
+        The model and search context size are picked by the tiering policy from the product's
+        complexity and the time left before the deadline (None means unconstrained).
+        If the deadline runs out first, a partial analysis computed from the product data is returned.
         """
         if not product.ingredients_text and not product.ingredients_list:
             logger.warning(f"No ingredients found for product {product.barcode}")
@@ -109,12 +121,28 @@ class PerplexitySonarService:
         Return the analysis as a clean, properly-formatted JSON object without any preamble or explanation.
         """
         
+        latency_budget = deadline.remaining() if deadline else None
+        if latency_budget is not None and latency_budget < settings.ANALYSIS_MIN_BUDGET:
+            logger.warning(f"Only {latency_budget:.1f}s left for product {product.barcode}, returning partial analysis")
+            return build_partial_analysis(product)
+        
         try:
-            logger.info(f"Starting comprehensive analysis for product: {product.name}")
-            result = await self._query_perplexity(prompt, model="sonar-pro")
-            analysis = self._parse_comprehensive_analysis(result)
-            logger.info(f"Completed comprehensive analysis for product: {product.name}")
+            tier = analysis_tier_policy.select(product, user_preferences, latency_budget)
+            logger.info(f"Starting comprehensive analysis for product: {product.name} (tier: {tier.name})")
+            result = await asyncio.wait_for(
+                self._query_perplexity(
+                    prompt,
+                    model=tier.model,
+                    search_context_size=tier.search_context_size
+                ),
+                timeout=latency_budget
+            )
+            analysis = self._parse_comprehensive_analysis(result, tier.name)
+            logger.info(f"Completed comprehensive analysis for product: {product.name} (tier: {tier.name})")
             return analysis
+        except asyncio.TimeoutError:
+            logger.warning(f"Deadline exceeded during analysis of product {product.barcode}, returning partial analysis")
+            return build_partial_analysis(product)
         except Exception as e:
             logger.error(f"Error in comprehensive analysis: {str(e)}")
             
@@ -190,9 +218,10 @@ class PerplexitySonarService:
                 ]
             )
     
-    def _parse_comprehensive_analysis(self, response: str) -> ProductAnalysis:
+    def _parse_comprehensive_analysis(self, response: str, analysis_tier: Optional[str] = None) -> ProductAnalysis:
         """
-        Parse the comprehensive analysis response from Perplexity
+        Parse the comprehensive analysis response from Perplexity.
+        The tier is only recorded on a successfully parsed analysis, not on the error fallback.
         """
         try:
             # Try to extract JSON from the response
@@ -276,7 +305,8 @@ class PerplexitySonarService:
                 nutrition_components=nutrition_components,
                 key_ingredients=key_ingredients,
                 additives=additives,
-                sources=sources
+                sources=sources,
+                analysis_tier=analysis_tier
             )
         except Exception as e:
             logger.error(f"Error parsing comprehensive analysis: {str(e)}")
@@ -364,7 +394,7 @@ class PerplexitySonarService:
             missing_citations = [i for i in range(1, max_citation + 1) if i > sources_count]
             logger.info(f"Missing citations filled: {missing_citations}")
     
-    async def _query_perplexity(self, prompt: str, model: str = "sonar-pro") -> str:
+    async def _query_perplexity(self, prompt: str, model: str = "sonar-pro", search_context_size: str = "medium") -> str:
         """
         Query the Perplexity Sonar API
         """
@@ -385,7 +415,7 @@ class PerplexitySonarService:
                 {"role": "user", "content": prompt}
             ],
             "temperature": 0.2,  # Lower temperature for more consistent outputs
-            "web_search_options": {"search_context_size": "medium"},
+            "web_search_options": {"search_context_size": search_context_size},
             "response_format": {
                 "type": "json_schema",
                 "json_schema": {
@@ -455,9 +485,11 @@ class PerplexitySonarService:
         
         url = f"{self.api_url}/chat/completions"
         
+        import httpx  # Deferred so importing this module stays cheap at startup
+        
         try:
             async with httpx.AsyncClient(timeout=120.0) as client:
-                logger.info(f"Sending request to Perplexity API with model: {model}")
+                logger.info(f"Sending request to Perplexity API with model: {model}, search context: {search_context_size}")
                 response = await client.post(url, json=payload, headers=headers)
                 response.raise_for_status()
                 data = response.json()
@@ -478,4 +510,9 @@ class PerplexitySonarService:
             logger.error(f"Error occurred while querying Perplexity: {e}")
             raise ValueError(f"Error querying Perplexity API: {str(e)}")
 
-perplexity_service = PerplexitySonarService() 
\ No newline at end of file
+@lru_cache(maxsize=None)
+def get_perplexity_service() -> PerplexitySonarService:
+    """
+    Return the shared service, creating it on first use
+    """
+    return PerplexitySonarService()
@@ -0,0 +1,145 @@
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple, Union
+
+from core.config import settings
+from core.gtin import normalize_gtin
+from schemas.food import FoodProduct, ProductAnalysis, UserHealthProfile
+from services.compact_cache import CompactAnalysis
+from services.perplexity import get_perplexity_service
+
+logger = logging.getLogger(__name__)
+
+
+def profile_hash(user_preferences: UserHealthProfile) -> str:
+    """
+    Stable short hash of a health profile, used to key prefetched analyses
+    """
+    return hashlib.sha256(user_preferences.model_dump_json().encode("utf-8")).hexdigest()[:16]
+
+
+# Product fields the analysis depends on. Brand and image URL are left out since clients
+# don't send them back consistently (the Flutter app sends "brands" and no image URL).
+ANALYZED_FIELDS = {"name", "ingredients_text", "ingredients_list", "nutrition_facts"}
+
+
+def _product_key(product: FoodProduct) -> Tuple[str, str]:
+    """
+    GTIN plus a hash of the analyzed product data, so an analysis is only reused for the data it was run on
+    """
+    try:
+        gtin = normalize_gtin(product.barcode)
+    except ValueError:
+        gtin = product.barcode
+    payload = product.model_dump_json(include=ANALYZED_FIELDS)
+    return gtin, hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class AnalysisPrefetcher:
+    """
+    Starts analyses speculatively when a product is looked up with a known profile, so the
+    analysis request that usually follows can attach to the running work instead of starting over.
+    Pending and finished results are parked for PREFETCH_TTL seconds; fallback and partial
+    results are not, so the analysis request retries instead of reusing them.
+    """
+
+    def __init__(self):
+        # (GTIN-14, product hash, profile hash) -> (running task or finished compact result, expiry)
+        self.pending: Dict[Tuple[str, str, str], Tuple[Union[asyncio.Task, CompactAnalysis], float]] = {}
+        # Profiles seen in analysis requests; lookups can only refer to these by hash
+        self.profiles: "OrderedDict[str, UserHealthProfile]" = OrderedDict()
+
+    def remember_profile(self, user_preferences: UserHealthProfile) -> str:
+        """
+        Record a profile and return its hash
+        """
+        key = profile_hash(user_preferences)
+        self.profiles[key] = user_preferences
+        self.profiles.move_to_end(key)
+        while len(self.profiles) > settings.PREFETCH_MAX_PROFILES:
+            self.profiles.popitem(last=False)
+        return key
+
+    def resolve_profile(self, key: str) -> Optional[UserHealthProfile]:
+        return self.profiles.get(key)
+
+    def start(self, product: FoodProduct, user_preferences: UserHealthProfile) -> None:
+        """
+        Begin analyzing a product in the background unless the same work is already parked
+        """
+        if not product.ingredients_text and not product.ingredients_list:
+            return
+
+        self._purge_expired()
+
+        key = (*_product_key(product), self.remember_profile(user_preferences))
+        if key in self.pending:
+            return
+
+        if len(self.pending) >= settings.PREFETCH_MAX_PENDING:
+            logger.warning(f"Prefetch table full, not prefetching analysis for {product.barcode}")
+            return
+
+        task = asyncio.create_task(get_perplexity_service().analyze_comprehensive(product, user_preferences))
+        task.add_done_callback(lambda done: self._park_result(key, done))
+        self.pending[key] = (task, time.monotonic() + settings.PREFETCH_TTL)
+        logger.info(f"Prefetching analysis for {product.barcode} (profile {key[2]})")
+
+    async def attach(self, product: FoodProduct, user_preferences: UserHealthProfile) -> Optional[ProductAnalysis]:
+        """
+        Return the prefetched analysis for this product and profile, waiting for it if still running.
+        Returns None when nothing was prefetched.
+        """
+        self._purge_expired()
+
+        key = (*_product_key(product), profile_hash(user_preferences))
+        entry = self.pending.get(key)
+        if entry is None:
+            return None
+
+        work, expires_at = entry
+        if isinstance(work, asyncio.Task) and not work.done():
+            # Keep the running work alive while this request waits on it
+            self.pending[key] = (work, max(expires_at, time.monotonic() + settings.PREFETCH_TTL))
+        logger.info(f"Attaching to prefetched analysis for {product.barcode} (profile {key[2]})")
+        if isinstance(work, CompactAnalysis):
+            return work.to_model()
+
+        # Shielded so a disconnecting client doesn't cancel the shared work
+        return await asyncio.shield(work)
+
+    def _park_result(self, key: Tuple[str, str, str], task: asyncio.Task) -> None:
+        """
+        Swap a finished task for its compact result, or drop it if it failed or only produced a fallback
+        """
+        entry = self.pending.get(key)
+        if entry is None or entry[0] is not task:
+            return
+
+        if task.cancelled() or task.exception() is not None:
+            del self.pending[key]
+            return
+
+        analysis = task.result()
+        # Only analyses produced by a model tier are worth reusing
+        if analysis.analysis_tier is None or analysis.partial:
+            del self.pending[key]
+            return
+
+        self.pending[key] = (CompactAnalysis(analysis), entry[1])
+
+    def _purge_expired(self) -> None:
+        now = time.monotonic()
+        for key, (work, expires_at) in list(self.pending.items()):
+            if expires_at > now:
+                continue
+            del self.pending[key]
+            # Nobody attached in time, stop paying for it
+            if isinstance(work, asyncio.Task) and not work.done():
+                work.cancel()
+
+
+analysis_prefetcher = AnalysisPrefetcher()
@@ -0,0 +1,201 @@
+import bisect
+import heapq
+import logging
+import math
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+from core.gtin import normalize_gtin
+from schemas.food import FoodProduct, ProductSearchResult
+
+logger = logging.getLogger(__name__)
+
+# Relative importance of a term depending on the field it was found in
+FIELD_WEIGHTS = {
+    "name": 3.0,
+    "brand": 2.0,
+    "ingredients": 1.0,
+}
+
+# Score multipliers for how a query term matched an indexed token
+EXACT_MATCH = 1.0
+PREFIX_MATCH = 0.7
+FUZZY_MATCH = 0.5
+
+MIN_FUZZY_LENGTH = 4  # Shorter terms only match exactly or by prefix
+MAX_PREFIX_EXPANSIONS = 50
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """
+    Lowercase, strip accents and split text into alphanumeric tokens
+    """
+    if not text:
+        return []
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return [token for token in _TOKEN_PATTERN.findall(stripped) if len(token) > 1]
+
+
+def _deletions(token: str) -> Set[str]:
+    return {token[:i] + token[i + 1:] for i in range(len(token))}
+
+
+def _within_one_edit(a: str, b: str) -> bool:
+    """
+    True if a and b differ by at most one insertion, deletion, substitution or adjacent transposition
+    """
+    if a == b:
+        return True
+    if abs(len(a) - len(b)) > 1:
+        return False
+
+    if len(a) == len(b):
+        diffs = [i for i in range(len(a)) if a[i] != b[i]]
+        if len(diffs) == 1:
+            return True
+        return (
+            len(diffs) == 2
+            and diffs[1] == diffs[0] + 1
+            and a[diffs[0]] == b[diffs[1]]
+            and a[diffs[1]] == b[diffs[0]]
+        )
+
+    shorter, longer = (a, b) if len(a) < len(b) else (b, a)
+    for i in range(len(longer)):
+        if longer[:i] + longer[i + 1:] == shorter:
+            return True
+    return False
+
+
+class ProductSearchIndex:
+    """
+    In-memory inverted index over product name, brand and ingredients.
+    Products are added as they pass through the OpenFoodFacts service. Query terms match
+    exactly, by prefix (sorted vocabulary) or within one typo (deletion neighbourhood lookup).
+    """
+
+    def __init__(self):
+        self.documents: Dict[str, ProductSearchResult] = {}  # GTIN-14 -> display fields
+        self.postings: Dict[str, Dict[str, float]] = defaultdict(dict)  # token -> {GTIN-14: field weight}
+        self.vocabulary: List[str] = []  # Sorted tokens, for prefix lookups
+        self.deletes: Dict[str, Set[str]] = defaultdict(set)  # token or token minus one char -> tokens
+        self._document_tokens: Dict[str, Set[str]] = {}
+
+    def add(self, product: FoodProduct) -> None:
+        """
+        Index a product, replacing any earlier version of it
+        """
+        try:
+            doc_id = normalize_gtin(product.barcode)
+        except ValueError:
+            doc_id = product.barcode
+
+        self.remove(doc_id)
+
+        weights: Dict[str, float] = {}
+        ingredients = product.ingredients_text or " ".join(product.ingredients_list or [])
+        for field, text in (("name", product.name), ("brand", product.brand), ("ingredients", ingredients)):
+            for token in tokenize(text):
+                weights[token] = max(weights.get(token, 0.0), FIELD_WEIGHTS[field])
+
+        for token, weight in weights.items():
+            if token not in self.postings:
+                self._add_to_vocabulary(token)
+            self.postings[token][doc_id] = weight
+
+        self.documents[doc_id] = ProductSearchResult(
+            barcode=product.barcode,
+            name=product.name,
+            brand=product.brand,
+            image_url=product.image_url,
+        )
+        self._document_tokens[doc_id] = set(weights)
+
+    def remove(self, doc_id: str) -> None:
+        for token in self._document_tokens.pop(doc_id, ()):
+            postings = self.postings.get(token)
+            if postings is None:
+                continue
+            postings.pop(doc_id, None)
+            if not postings:
+                del self.postings[token]
+                self._remove_from_vocabulary(token)
+        self.documents.pop(doc_id, None)
+
+    def search(self, query: str, limit: int = 20) -> List[ProductSearchResult]:
+        """
+        Rank products against the query; products matching more query terms always rank higher
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        scores: Dict[str, float] = defaultdict(float)
+        matched_terms: Dict[str, int] = defaultdict(int)
+
+        for term in terms:
+            term_scores: Dict[str, float] = {}
+            for token, quality in self._expand(term):
+                postings = self.postings[token]
+                idf = math.log(1 + len(self.documents) / len(postings))
+                for doc_id, field_weight in postings.items():
+                    score = quality * field_weight * idf
+                    if score > term_scores.get(doc_id, 0.0):
+                        term_scores[doc_id] = score
+
+            for doc_id, score in term_scores.items():
+                scores[doc_id] += score
+                matched_terms[doc_id] += 1
+
+        ranked = heapq.nlargest(limit, scores, key=lambda doc_id: (matched_terms[doc_id], scores[doc_id]))
+        return [
+            self.documents[doc_id].model_copy(update={"score": round(scores[doc_id], 3)})
+            for doc_id in ranked
+        ]
+
+    def _expand(self, term: str) -> List[Tuple[str, float]]:
+        """
+        Find indexed tokens matching a query term, with the quality of each match
+        """
+        matches: Dict[str, float] = {}
+
+        start = bisect.bisect_left(self.vocabulary, term)
+        for token in self.vocabulary[start:start + MAX_PREFIX_EXPANSIONS]:
+            if not token.startswith(term):
+                break
+            matches[token] = EXACT_MATCH if token == term else PREFIX_MATCH
+
+        if len(term) >= MIN_FUZZY_LENGTH:
+            candidates: Set[str] = set(self.deletes.get(term, ()))
+            for variant in _deletions(term):
+                candidates |= self.deletes.get(variant, set())
+            for token in candidates:
+                if token not in matches and _within_one_edit(term, token):
+                    matches[token] = FUZZY_MATCH
+
+        return list(matches.items())
+
+    def _add_to_vocabulary(self, token: str) -> None:
+        bisect.insort(self.vocabulary, token)
+        if len(token) >= MIN_FUZZY_LENGTH - 1:
+            for key in _deletions(token) | {token}:
+                self.deletes[key].add(token)
+
+    def _remove_from_vocabulary(self, token: str) -> None:
+        index = bisect.bisect_left(self.vocabulary, token)
+        if index < len(self.vocabulary) and self.vocabulary[index] == token:
+            del self.vocabulary[index]
+        for key in _deletions(token) | {token}:
+            tokens = self.deletes.get(key)
+            if tokens is not None:
+                tokens.discard(token)
+                if not tokens:
+                    del self.deletes[key]
+
+
+search_index = ProductSearchIndex()
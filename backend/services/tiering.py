@@ -0,0 +1,113 @@
+import logging
+import re
+from dataclasses import dataclass
+from typing import List, Optional
+
+from core.config import settings
+from schemas.food import FoodProduct, UserHealthProfile
+
+logger = logging.getLogger(__name__)
+
+# E-numbers such as E330, e442 or E 150d
+ADDITIVE_PATTERN = re.compile(r"\bE\s?-?(\d{3,4}[a-z]?)\b", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class AnalysisTier:
+    name: str
+    model: str
+    search_context_size: str  # "low", "medium" or "high"
+    min_budget: float  # Seconds of latency budget this tier needs
+
+
+def count_ingredients(product: FoodProduct) -> int:
+    """
+    Count the product's ingredients from the parsed list, falling back to the raw text
+    """
+    if product.ingredients_list:
+        return len(product.ingredients_list)
+    if product.ingredients_text:
+        return len([part for part in re.split(r"[,;]", product.ingredients_text) if part.strip()])
+    return 0
+
+
+def detect_additives(product: FoodProduct) -> List[str]:
+    """
+    Find distinct E-number additives mentioned in the ingredients
+    """
+    text = product.ingredients_text or " ".join(product.ingredients_list or [])
+    return sorted({f"E{match.upper()}" for match in ADDITIVE_PATTERN.findall(text)})
+
+
+class AnalysisTierPolicy:
+    """
+    Picks the Perplexity model and search context size from product complexity and the latency budget.
+    Simple products get a cheaper, faster tier; complex products and health profiles get the full one.
+    """
+
+    def __init__(self):
+        self.tiers = [
+            AnalysisTier(
+                name="light",
+                model=settings.ANALYSIS_TIER_LIGHT_MODEL,
+                search_context_size=settings.ANALYSIS_TIER_LIGHT_SEARCH_CONTEXT,
+                min_budget=0.0,
+            ),
+            AnalysisTier(
+                name="standard",
+                model=settings.ANALYSIS_TIER_STANDARD_MODEL,
+                search_context_size=settings.ANALYSIS_TIER_STANDARD_SEARCH_CONTEXT,
+                min_budget=settings.ANALYSIS_TIER_STANDARD_MIN_BUDGET,
+            ),
+            AnalysisTier(
+                name="full",
+                model=settings.ANALYSIS_TIER_FULL_MODEL,
+                search_context_size=settings.ANALYSIS_TIER_FULL_SEARCH_CONTEXT,
+                min_budget=settings.ANALYSIS_TIER_FULL_MIN_BUDGET,
+            ),
+        ]
+
+    def complexity_score(self, product: FoodProduct, user_preferences: UserHealthProfile) -> int:
+        """
+        Score how much research an analysis needs; additives and health conditions weigh the most
+        """
+        return (
+            count_ingredients(product)
+            + 3 * len(detect_additives(product))
+            + 3 * len(user_preferences.health_conditions or [])
+            + len(user_preferences.allergies or [])
+        )
+
+    def select(
+        self,
+        product: FoodProduct,
+        user_preferences: UserHealthProfile,
+        latency_budget: Optional[float] = None,
+    ) -> AnalysisTier:
+        """
+        Choose a tier for the product, stepping down while the latency budget is too small for it
+        """
+        if not settings.ANALYSIS_TIERING_ENABLED:
+            return self.tiers[-1]
+
+        score = self.complexity_score(product, user_preferences)
+        if score <= settings.ANALYSIS_TIER_LIGHT_MAX_SCORE:
+            index = 0
+        elif score <= settings.ANALYSIS_TIER_STANDARD_MAX_SCORE:
+            index = 1
+        else:
+            index = 2
+
+        if latency_budget is not None:
+            while index > 0 and latency_budget < self.tiers[index].min_budget:
+                index -= 1
+
+        tier = self.tiers[index]
+        logger.info(
+            f"Selected analysis tier '{tier.name}' ({tier.model}, {tier.search_context_size} context) "
+            f"for {product.barcode}: complexity {score}, budget {latency_budget}"
+        )
+        return tier
+
+
+analysis_tier_policy = AnalysisTierPolicy()
@@ -5,17 +5,23 @@ Production startup script for What's In It API
 import os
 import sys
 import logging
-import uvicorn
 
 # Add the backend directory to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from main import app
+# Imported first so every later phase is timed from process start
+from core.startup import startup_report
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+with startup_report.phase("import uvicorn"):
+    import uvicorn
+
+with startup_report.phase("import main"):
+    from main import app
+
 if __name__ == "__main__":
     # Get port from environment or default to 8000
     port = int(os.getenv("PORT", 8000))
@@ -116,7 +116,7 @@ export default function HistoryPage() {
                         <span>{formatDate(item.scannedAt)}</span>
                       </div>
                       
-                      {item.analysisResult && (
+                      {item.analysisResult && item.analysisResult.health_score !== null && (
                         <div className="flex items-center space-x-2">
                           <div className={`w-2 h-2 rounded-full ${
                             item.analysisResult.health_score >= 80 ? 'bg-green-500' :
@@ -125,6 +125,7 @@ export default function AnalysisDisplay() {
   }
 
   const isRecommended = currentAnalysis.recommendation === 'recommended';
+  const isPartial = currentAnalysis.recommendation === null;
   
   return (
     <div className="space-y-6">
@@ -146,13 +147,21 @@ export default function AnalysisDisplay() {
         <div className="grid md:grid-cols-2 gap-6">
           {/* Health Score */}
           <div className="flex items-center space-x-4">
-            <ScoreCircle score={currentAnalysis.health_score} size="lg" />
+            {currentAnalysis.health_score !== null ? (
+              <ScoreCircle score={currentAnalysis.health_score} size="lg" />
+            ) : (
+              <div className="w-12 h-12 rounded-full flex items-center justify-center bg-gray-100">
+                <Clock className="w-6 h-6 text-gray-600" />
+              </div>
+            )}
             <div>
               <h3 className="text-lg font-semibold text-[var(--text-primary)]">
                 Health Score
               </h3>
               <p className="text-sm text-[var(--text-secondary)]">
-                Based on ingredients and nutrition
+                {currentAnalysis.health_score !== null
+                  ? 'Based on ingredients and nutrition'
+                  : 'Not available for a partial analysis'}
               </p>
             </div>
           </div>
@@ -160,9 +169,11 @@ export default function AnalysisDisplay() {
           {/* Recommendation */}
           <div className="flex items-start space-x-4">
             <div className={`w-12 h-12 rounded-full flex items-center justify-center ${
-              isRecommended ? 'bg-green-100' : 'bg-red-100'
+              isPartial ? 'bg-gray-100' : isRecommended ? 'bg-green-100' : 'bg-red-100'
             }`}>
-              {isRecommended ? (
+              {isPartial ? (
+                <Info className="w-6 h-6 text-gray-600" />
+              ) : isRecommended ? (
                 <CheckCircle className="w-6 h-6 text-green-600" />
               ) : (
                 <XCircle className="w-6 h-6 text-red-600" />
@@ -170,9 +181,9 @@ export default function AnalysisDisplay() {
             </div>
             <div className="flex-1">
               <h3 className={`text-lg font-semibold ${
-                isRecommended ? 'text-green-700' : 'text-red-700'
+                isPartial ? 'text-gray-700' : isRecommended ? 'text-green-700' : 'text-red-700'
               }`}>
-                {isRecommended ? 'Recommended' : 'Not Recommended'}
+                {isPartial ? 'Partial Analysis' : isRecommended ? 'Recommended' : 'Not Recommended'}
               </h3>
               <p className="text-sm text-[var(--text-secondary)] leading-relaxed">
                 {currentAnalysis.recommendation_reason}
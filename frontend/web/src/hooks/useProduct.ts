@@ -35,7 +35,7 @@ export const useProduct = () => {
     clearError();
 
     try {
-      const product = await apiService.getProductByBarcode(cleanBarcode);
+      const product = await apiService.getProductByBarcode(cleanBarcode, userPreferences);
       setCurrentProduct(product);
       setProductLoadingState('success');
       
@@ -53,6 +53,7 @@ export const useProduct = () => {
       return false;
     }
   }, [
+    userPreferences,
     setCurrentProduct,
     setCurrentAnalysis,
     setProductLoadingState,
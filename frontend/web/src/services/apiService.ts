@@ -1,20 +1,27 @@
 import { Product, AnalysisResult, UserPreferences, ComprehensiveAnalysisRequest, ApiError } from '@/types';
 
+type UserPreferencesPayload = ComprehensiveAnalysisRequest['user_preferences'];
+
 class ApiService {
   private readonly baseUrl = 'https://api.whats-in-it.org';
   
+  // X-Profile-Hash issued by the last analysis response and the preferences it was issued for.
+  // Sent on product lookups so the server can start the analysis early (if prefetch is enabled there).
+  private profileHash: { preferences: string; hash: string } | null = null;
+  
   private async request<T>(
     endpoint: string, 
-    options: RequestInit = {}
+    options: RequestInit = {},
+    onResponse?: (response: Response) => void
   ): Promise<T> {
     const url = `${this.baseUrl}${endpoint}`;
     
     const config: RequestInit = {
+      ...options,
       headers: {
         'Content-Type': 'application/json',
         ...options.headers,
       },
-      ...options,
     };
 
     console.log(`API Request to: ${url}`);
@@ -57,6 +64,8 @@ class ApiService {
         throw apiError;
       }
 
+      onResponse?.(response);
+
       const data = await response.json();
       console.log('Response data:', data);
       
@@ -77,14 +86,37 @@ class ApiService {
     }
   }
 
-  async getProductByBarcode(barcode: string): Promise<Product> {
+  private toUserPreferencesPayload(preferences: UserPreferences): UserPreferencesPayload {
+    return {
+      diet_type: preferences.dietType,
+      allergies: preferences.allergies,
+      avoid_ingredients: preferences.avoidIngredients,
+      health_concerns: {
+        sugar: preferences.sugarConcern,
+        salt: preferences.saltConcern,
+        fat: preferences.fatConcern,
+      },
+    };
+  }
+
+  async getProductByBarcode(barcode: string, preferences?: UserPreferences): Promise<Product> {
     const timeoutController = new AbortController();
     const timeoutId = setTimeout(() => timeoutController.abort(), 45000); // 45 second timeout
     
+    // Only reference the profile hash if it still matches the current preferences
+    const headers: Record<string, string> = {};
+    if (
+      preferences &&
+      this.profileHash &&
+      this.profileHash.preferences === JSON.stringify(this.toUserPreferencesPayload(preferences))
+    ) {
+      headers['X-Profile-Hash'] = this.profileHash.hash;
+    }
+    
     try {
       const product = await this.request<Product>(
         `/api/v1/product/${barcode}`,
-        { signal: timeoutController.signal }
+        { signal: timeoutController.signal, headers }
       );
       
       return product;
@@ -116,16 +148,7 @@ class ApiService {
           ingredients_list: product.ingredients_list,
           nutrition_facts: product.nutrition_facts,
         },
-        user_preferences: {
-          diet_type: preferences.dietType,
-          allergies: preferences.allergies,
-          avoid_ingredients: preferences.avoidIngredients,
-          health_concerns: {
-            sugar: preferences.sugarConcern,
-            salt: preferences.saltConcern,
-            fat: preferences.fatConcern,
-          },
-        },
+        user_preferences: this.toUserPreferencesPayload(preferences),
       };
 
       const analysis = await this.request<AnalysisResult>(
@@ -134,6 +157,15 @@ class ApiService {
           method: 'POST',
           body: JSON.stringify(requestBody),
           signal: timeoutController.signal,
+        },
+        (response) => {
+          const hash = response.headers.get('X-Profile-Hash');
+          if (hash) {
+            this.profileHash = {
+              preferences: JSON.stringify(requestBody.user_preferences),
+              hash,
+            };
+          }
         }
       );
 
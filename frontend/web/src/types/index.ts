@@ -38,13 +38,14 @@ export interface NutritionFacts {
 
 // Analysis Result Types (matching Flutter's AnalysisResult model)
 export interface AnalysisResult {
-  health_score: number;
-  recommendation: 'recommended' | 'not recommended';
+  health_score: number | null; // null on partial results
+  recommendation: 'recommended' | 'not recommended' | null; // null on partial results
   recommendation_reason: string;
   nutrition_components: NutritionComponent[];
   key_ingredients: KeyIngredient[];
   additives: Additive[];
   sources?: Citation[];
+  partial?: boolean;
 }
 
 export interface NutritionComponent {
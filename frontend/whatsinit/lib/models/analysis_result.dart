@@ -6,6 +6,8 @@ class AnalysisResult {
   final Map<String, dynamic> dietCompatibility;
   final Map<String, dynamic> allergenInfo;
   final List<Map<String, dynamic>> sources;
+  // True when the backend ran out of time: no score or recommendation, only nutrient levels and additives
+  final bool partial;
 
   AnalysisResult({
     required this.summary,
@@ -15,13 +17,14 @@ class AnalysisResult {
     required this.dietCompatibility,
     required this.allergenInfo,
     required this.sources,
+    this.partial = false,
   });
 
   factory AnalysisResult.fromJson(Map<String, dynamic> json) {
     try {
-      // Create summary from health score and recommendation
+      // Create summary from health score and recommendation (both null on partial results)
       final Map<String, dynamic> summary = {
-        'overall_score': json['health_score'] ?? 0,
+        'overall_score': json['health_score'],
         'recommendation': json['recommendation'] ?? 'No recommendation available',
         'recommendation_reason': json['recommendation_reason'] ?? '',
       };
@@ -65,7 +68,9 @@ class AnalysisResult {
       // Extract diet compatibility from recommendation reason
       final Map<String, dynamic> dietCompatibility = {
         'Compatibility': {
-          'status': json['recommendation'] == 'not recommended' ? 'Not Compatible' : 'Compatible',
+          'status': json['recommendation'] == null
+              ? 'Unknown'
+              : json['recommendation'] == 'not recommended' ? 'Not Compatible' : 'Compatible',
           'reason': json['recommendation_reason'] ?? '',
         }
       };
@@ -87,6 +92,7 @@ class AnalysisResult {
         dietCompatibility: dietCompatibility,
         allergenInfo: {}, // No allergen data in the current API response
         sources: sources,
+        partial: json['partial'] ?? false,
       );
     } catch (e) {
       print('Error parsing analysis result: $e');
@@ -107,10 +113,10 @@ class AnalysisResult {
     }
   }
 
-  // Get a simple overall rating from 0-100
-  int getOverallRating() {
+  // Get a simple overall rating from 0-100, or null when the analysis is partial
+  int? getOverallRating() {
     try {
-      return summary['overall_score'] ?? 0;
+      return summary['overall_score'];
     } catch (e) {
       return 0; // Default rating if there's an error
     }
@@ -129,7 +129,13 @@ class AnalysisResultView extends StatelessWidget {
     String statusText;
 
     // Determine colors, emoji, and status text based on score
-    if (overallScore >= 71) { // High Score (71-100)
+    if (overallScore == null) { // Partial analysis, no score or recommendation
+      gradientColors = [const Color(0xFFF5F5F5), const Color(0xFFFAFAFA)];
+      circleBgColor = const Color(0xFFBDBDBD); // Material Colors.grey[400]
+      labelColor = const Color(0xFF616161);   // Material Colors.grey[700]
+      statusText = 'Partial Analysis';
+      emoji = '⏳';
+    } else if (overallScore >= 71) { // High Score (71-100)
       gradientColors = [const Color(0xFFE8F5E9), const Color(0xFFF1F8E9)];
       circleBgColor = const Color(0xFF81C784); // Material Colors.green[300]
       labelColor = const Color(0xFF388E3C);   // Material Colors.green[700]
@@ -190,7 +196,7 @@ class AnalysisResultView extends StatelessWidget {
               ),
               child: Center(
                 child: Text(
-                  '$overallScore',
+                  overallScore == null ? '?' : '$overallScore',
                   style: const TextStyle(fontSize: 32, fontWeight: FontWeight.bold, color: Colors.white),
                 ),
               ),